@@ -1,30 +1,51 @@
 from __future__ import annotations
 
 import builtins
+import ctypes
+import errno
 import fnmatch
+import heapq
+import multiprocessing
 import os
+import platform
+import queue
+import re
 import shutil
+import sys
+import threading
+import time
 import typing
-from collections.abc import Iterable
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
+from contextlib import closing, suppress
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from enum import Enum
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
 from typing import Annotated
 
 import typer
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
 
+if sys.platform != "win32":
+    import resource
+
 app: typer.Typer = typer.Typer(help="Sweep old files from a directory (local now, S3 later).")
 console = Console()
+err_console = Console(stderr=True)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Target:
-    path: Path
+    dir_fd: int | None
+    name: str
+    # Kept as str: the walker never builds a Path, and callers only print or open it
+    path: str
     size: int
-    mtime: datetime
+    mtime_ts: float
 
 
 def get_seconds(older_than: str) -> int:
@@ -44,43 +65,698 @@ def get_seconds(older_than: str) -> int:
         raise typer.BadParameter(f"Invalid time unit in older-than: {unit}. Use d, h, or m.")
 
 
-def _iter_targets(root: Path, pattern: str, older_than: str) -> Iterable[Target]:
-    # Create function to take the string and return seconds
-    cutoff = datetime.now(timezone.utc) - timedelta(seconds=get_seconds(older_than))
-    for dirpath, _dirnames, filenames in os.walk(root):
-        for name in filenames:
-            if not fnmatch.fnmatch(name, pattern):
-                continue
-            p = Path(dirpath) / name
-            try:
-                stat = p.stat()
-            except OSError:
-                raise OSError(f"Error accessing {p}") from None
-            mtime = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
-            if mtime <= cutoff:
-                yield Target(p, stat.st_size, mtime)
+class _StatxTimestamp(ctypes.Structure):
+    _fields_ = [
+        ("tv_sec", ctypes.c_int64),
+        ("tv_nsec", ctypes.c_uint32),
+        ("_reserved", ctypes.c_int32),
+    ]
+
+
+class _Statx(ctypes.Structure):
+    """Mirror of the kernel's ``struct statx`` (linux/stat.h)."""
+
+    _fields_ = [
+        ("stx_mask", ctypes.c_uint32),
+        ("stx_blksize", ctypes.c_uint32),
+        ("stx_attributes", ctypes.c_uint64),
+        ("stx_nlink", ctypes.c_uint32),
+        ("stx_uid", ctypes.c_uint32),
+        ("stx_gid", ctypes.c_uint32),
+        ("stx_mode", ctypes.c_uint16),
+        ("_spare0", ctypes.c_uint16),
+        ("stx_ino", ctypes.c_uint64),
+        ("stx_size", ctypes.c_uint64),
+        ("stx_blocks", ctypes.c_uint64),
+        ("stx_attributes_mask", ctypes.c_uint64),
+        ("stx_atime", _StatxTimestamp),
+        ("stx_btime", _StatxTimestamp),
+        ("stx_ctime", _StatxTimestamp),
+        ("stx_mtime", _StatxTimestamp),
+        ("stx_rdev_major", ctypes.c_uint32),
+        ("stx_rdev_minor", ctypes.c_uint32),
+        ("stx_dev_major", ctypes.c_uint32),
+        ("stx_dev_minor", ctypes.c_uint32),
+        ("_spare2", ctypes.c_uint64 * 14),
+    ]
+
+
+_AT_FDCWD = -100
+_AT_SYMLINK_NOFOLLOW = 0x100
+_AT_STATX_DONT_SYNC = 0x4000
+_STATX_MTIME = 0x40
+_STATX_SIZE = 0x200
+
+
+def _load_statx() -> typing.Any:
+    if platform.system() != "Linux":
+        return None
+    try:
+        fn = ctypes.CDLL(None, use_errno=True).statx  # glibc >= 2.28
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = [
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_int,
+        ctypes.c_uint,
+        ctypes.POINTER(_Statx),
+    ]
+    fn.restype = ctypes.c_int
+    # Probe once: the libc wrapper exists on kernels < 4.11 but returns ENOSYS there
+    if fn(_AT_FDCWD, b".", 0, _STATX_MTIME | _STATX_SIZE, ctypes.byref(_Statx())) != 0:
+        return None
+    return fn
+
+
+_statx = _load_statx()
+_HAS_STATX = _statx is not None
+
+
+def _statx_mtime_size(path: str, dir_fd: int = _AT_FDCWD) -> tuple[float, int]:
+    """Fetch only mtime and size, without forcing a sync on network filesystems."""
+    buf = _Statx()
+    flags = _AT_STATX_DONT_SYNC | _AT_SYMLINK_NOFOLLOW
+    if _statx(dir_fd, os.fsencode(path), flags, _STATX_MTIME | _STATX_SIZE, ctypes.byref(buf)):
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), path)
+    mtime = buf.stx_mtime.tv_sec + buf.stx_mtime.tv_nsec * 1e-9
+    return (mtime, buf.stx_size)
+
+
+def _compile_pattern(pattern: str) -> Callable[[str], object] | None:
+    """Build a filename predicate equivalent to ``fnmatch.fnmatch(name, pattern)``.
+
+    Returns None when every name matches, so the walker can skip the check.
+    """
+    # "*", "**", ... match every name; the walker then skips the call entirely
+    if pattern and pattern.strip("*") == "":
+        return None
+    # fnmatch normalises case on case-insensitive platforms (Windows)
+    flags = re.IGNORECASE if os.path.normcase("A") != "A" else 0
+    suffix = pattern[1:]
+    if pattern.startswith("*.") and not flags and not any(c in suffix for c in "*?["):
+        return lambda name: name.endswith(suffix)
+    return re.compile(fnmatch.translate(pattern), flags).match
+
+
+# Directories that never hold sweepable files; the walker does not descend into them
+_PRUNE = frozenset({".git", "__pycache__", "node_modules", ".venv"})
+
+# Called with the path and error for entries the walker could not read
+_OnError = Callable[[str, OSError], None]
+
+
+def _fd_budget() -> int:
+    """How many directory fds may be lent to in-flight Targets at once."""
+    if sys.platform == "win32":
+        return 0
+    soft, _hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        soft = 4096
+    # Leave the rest for scandir handles along the walk, archive copies and the interpreter
+    return max(8, soft // 4)
+
+
+class _DirFds:
+    """Directory fds shared by the walker and workers, closed once nothing refers to them.
+
+    The walker holds one reference while it is inside a directory and every yielded
+    Target holds another until it is released, so open fds track in-flight work rather
+    than the number of directories swept. At most ``budget`` fds are lent at once;
+    past that, Targets are yielded without one and use path-based operations.
+    """
+
+    def __init__(self, budget: int | None = None) -> None:
+        self._lock = threading.Lock()
+        self._refs: dict[int, int] = {}
+        self._budget = _fd_budget() if budget is None else budget
+
+    def lend(self, fd: int) -> bool:
+        with self._lock:
+            if len(self._refs) >= self._budget:
+                return False
+            self._refs[fd] = 1
+            return True
+
+    def acquire(self, fd: int) -> None:
+        with self._lock:
+            self._refs[fd] += 1
+
+    def release(self, fd: int) -> None:
+        with self._lock:
+            refs = self._refs[fd] - 1
+            if refs:
+                self._refs[fd] = refs
+                return
+            del self._refs[fd]
+        os.close(fd)
+
+    def release_all(self, targets: Iterable[Target]) -> None:
+        for t in targets:
+            if t.dir_fd is not None:
+                self.release(t.dir_fd)
+
+    def close(self) -> None:
+        """Close whatever is still open, e.g. after an aborted sweep."""
+        with self._lock:
+            fds = builtins.list(self._refs)
+            self._refs.clear()
+        for fd in fds:
+            os.close(fd)
+
+
+# Filesystems where a plain stat may revalidate with the server; DONT_SYNC pays off there
+_NETWORK_FS = frozenset(
+    {"nfs", "nfs4", "cifs", "smb3", "smbfs", "ceph", "9p", "afs", "glusterfs", "lustre"}
+)
+
+
+def _fs_type(path: str) -> str | None:
+    """Filesystem type of the mount holding ``path``, from /proc/self/mountinfo."""
+    real = os.path.realpath(path)
+    best, fstype = "", None
+    try:
+        with open("/proc/self/mountinfo") as f:
+            for line in f:
+                fields = line.split()
+                # Mount points escape spaces and friends as octal, e.g. \040
+                mnt = re.sub(r"\\([0-7]{3})", lambda m: chr(int(m[1], 8)), fields[4])
+                fs = fields[fields.index("-") + 1]
+                inside = real == mnt or real.startswith(mnt.rstrip("/") + "/")
+                if inside and len(mnt) >= len(best):
+                    best, fstype = mnt, fs
+    except (OSError, ValueError, IndexError):
+        return None
+    return fstype
+
+
+def _use_statx(path: str) -> bool:
+    # Through ctypes, statx costs more per call than DirEntry.stat() on local disks
+    return _HAS_STATX and _fs_type(path) in _NETWORK_FS
+
+
+# Like os.fwalk, read directories through fds opened relative to their parent
+_USE_DIR_FD = os.unlink in os.supports_dir_fd and os.scandir in os.supports_fd
+_O_DIR = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
+_O_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+
+
+def _is_dir(e: os.DirEntry[str], key: tuple[int, int] | None) -> bool:
+    """Whether ``e`` is the directory identified by ``(st_dev, st_ino)``."""
+    if key is None or e.inode() != key[1]:
+        return False
+    try:
+        return e.stat(follow_symlinks=False).st_dev == key[0]
+    except OSError:
+        return False
+
+
+def _scan(
+    path: str,
+    match: Callable[[str], object] | None,
+    cutoff_ts: float,
+    prune: frozenset[str],
+    on_error: _OnError,
+    fds: _DirFds | None,
+    recurse: bool = True,
+    parent_fd: int | None = None,
+    use_statx: bool = False,
+    skip: tuple[int, int] | None = None,
+) -> Iterable[Target]:
+    dir_fd: int | None = None
+    try:
+        if _USE_DIR_FD:
+            if parent_fd is None:
+                dir_fd = os.open(path, _O_DIR)
+            else:
+                # NOFOLLOW: a directory swapped for a symlink mid-walk is not entered
+                dir_fd = os.open(os.path.basename(path), _O_DIR | _O_NOFOLLOW, dir_fd=parent_fd)
+            it = os.scandir(dir_fd)
+        else:
+            it = os.scandir(path)
+    except OSError as exc:
+        # Unreadable directories are reported and skipped, as os.walk's onerror does
+        if dir_fd is not None:
+            os.close(dir_fd)
+        on_error(path, exc)
+        return
+    # Set once a yielded Target refers to dir_fd, which then outlives the scan until released
+    lent: _DirFds | None = None
+    subdirs: builtins.list[str] = []
+    try:
+        with it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    # Pruned before descent, like trimming dirnames in a top-down os.walk
+                    if recurse and e.name not in prune and not _is_dir(e, skip):
+                        subdirs.append(e.name)
+                elif e.is_file(follow_symlinks=False) and (match is None or match(e.name)):
+                    try:
+                        if use_statx:
+                            if dir_fd is None:
+                                mtime_ts, size = _statx_mtime_size(e.path)
+                            else:
+                                mtime_ts, size = _statx_mtime_size(e.name, dir_fd)
+                        else:
+                            st = e.stat(follow_symlinks=False)
+                            mtime_ts, size = st.st_mtime, st.st_size
+                    except OSError as exc:
+                        # e.g. deleted by another process since readdir; keep sweeping
+                        on_error(os.path.join(path, e.name), exc)
+                        continue
+                    if mtime_ts <= cutoff_ts:
+                        t_fd = None
+                        if dir_fd is not None and fds is not None:
+                            if lent is None and fds.lend(dir_fd):
+                                lent = fds
+                            if lent is not None:
+                                lent.acquire(dir_fd)
+                                t_fd = dir_fd
+                        yield Target(t_fd, e.name, os.path.join(path, e.name), size, mtime_ts)
+        # Descend only after this directory's scandir handle is closed
+        for sub in subdirs:
+            sub_path = os.path.join(path, sub)
+            yield from _scan(
+                sub_path, match, cutoff_ts, prune, on_error, fds, True, dir_fd, use_statx, skip
+            )
+    finally:
+        if dir_fd is not None:
+            if lent is not None:
+                lent.release(dir_fd)
+            else:
+                os.close(dir_fd)
+
+
+def _cutoff_ts(older_than: str) -> float:
+    # Compared directly against st_mtime; only rendering ever builds a datetime
+    return time.time() - get_seconds(older_than)
+
+
+def _iter_targets(
+    root: Path,
+    pattern: str,
+    older_than: str,
+    prune: Iterable[str] = (),
+    on_error: _OnError | None = None,
+) -> Iterable[Target]:
+    """Yield matching files older than the threshold.
+
+    Directories named in ``_PRUNE`` or ``prune`` are not descended into. Entries
+    that cannot be read are passed to ``on_error`` (or dropped) and the walk goes on.
+    """
+    match = _compile_pattern(pattern)
+    cutoff_ts = _cutoff_ts(older_than)
+    on_error = on_error or (lambda _path, _exc: None)
+    path = os.fspath(root)
+    yield from _scan(
+        path, match, cutoff_ts, _PRUNE.union(prune), on_error, None, use_statx=_use_statx(path)
+    )
 
 
 def _delete(t: Target, dry_run: bool) -> tuple[Target, Exception | None]:
     try:
         if not dry_run:
-            t.path.unlink(missing_ok=True)
+            with suppress(FileNotFoundError):
+                if t.dir_fd is None:
+                    os.unlink(t.path)
+                else:
+                    os.unlink(t.name, dir_fd=t.dir_fd)
         return (t, None)
     except Exception as e:  # noqa: BLE001
         return (t, e)
 
 
+_COPY_CHUNK = 1 << 30
+# copy_file_range refuses these pairings (old kernels, cross-filesystem, special files)
+_COPY_FALLBACK_ERRNOS = frozenset({errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL})
+
+
+def _copy_file_range(t: Target, dst: Path) -> bool:
+    """Copy ``t`` to ``dst`` inside the kernel; False means fall back to shutil."""
+    if not hasattr(os, "copy_file_range"):
+        return False
+    src = t.name if t.dir_fd is not None else t.path
+    src_fd = os.open(src, os.O_RDONLY, dir_fd=t.dir_fd)
+    try:
+        # O_TRUNC below would empty the source if both names are the same file
+        with suppress(FileNotFoundError):
+            if os.path.samestat(os.fstat(src_fd), os.stat(dst)):
+                raise shutil.SameFileError(f"{t.path!r} and {str(dst)!r} are the same file")
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        copied = 0
+        try:
+            while n := os.copy_file_range(src_fd, dst_fd, _COPY_CHUNK):
+                copied += n
+        except OSError as e:
+            if copied or e.errno not in _COPY_FALLBACK_ERRNOS:
+                raise
+            return False
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    # Some pseudo-filesystems report EOF straight away; let shutil read those
+    return copied > 0 or t.size == 0
+
+
 def _copy(t: Target, archive_path: Path, dry_run: bool) -> tuple[Target, Exception | None]:
     try:
         if not dry_run:
-            archive_target = archive_path / t.path.name
-            archive_path.mkdir(parents=True, exist_ok=True)
-            shutil.copyfile(t.path, archive_target)
+            archive_target = archive_path / t.name
+            if not _copy_file_range(t, archive_target):
+                shutil.copyfile(t.path, archive_target)
+        return (t, None)
+    except Exception as e:  # noqa: BLE001
+        return (t, e)
+
+
+def _move(t: Target, archive_path: Path, dry_run: bool) -> tuple[Target, Exception | None]:
+    try:
+        if not dry_run:
+            os.replace(t.path, archive_path / t.name)
         return (t, None)
     except Exception as e:  # noqa: BLE001
         return (t, e)
 
 
+def _dir_dev(t: Target, cache: dict[str, int]) -> int:
+    parent = os.path.dirname(t.path)
+    dev = cache.get(parent)
+    if dev is None:
+        dev = os.fstat(t.dir_fd).st_dev if t.dir_fd is not None else os.stat(parent).st_dev
+        cache[parent] = dev
+    return dev
+
+
+# (action, path, error) reported by a worker; action is "scan", "archive" or "delete"
+_Report = tuple[str, str, Exception | None]
+# None marks a worker that has finished
+_Result = _Report | None
+
+
+class Backend(typing.Protocol):
+    """Storage that deletes targets in batches of up to ``batch_size``."""
+
+    batch_size: int
+
+    def delete_batch(
+        self, targets: Sequence[Target], dry_run: bool
+    ) -> builtins.list[tuple[Target, Exception | None]]: ...
+
+
+class LocalBackend:
+    # Small batches keep every worker busy on modest sweeps
+    batch_size = 16
+
+    def delete_batch(
+        self, targets: Sequence[Target], dry_run: bool
+    ) -> builtins.list[tuple[Target, Exception | None]]:
+        return [_delete(t, dry_run) for t in targets]
+
+
+class S3Backend:
+    """Delete objects with one DeleteObjects request per 1000 keys (the API maximum)."""
+
+    batch_size = 1000
+
+    def __init__(self, client: typing.Any, bucket: str) -> None:
+        self.client = client
+        self.bucket = bucket
+
+    def delete_batch(
+        self, targets: Sequence[Target], dry_run: bool
+    ) -> builtins.list[tuple[Target, Exception | None]]:
+        out: builtins.list[tuple[Target, Exception | None]] = []
+        for i in range(0, len(targets), self.batch_size):
+            chunk = targets[i : i + self.batch_size]
+            if dry_run:
+                out += [(t, None) for t in chunk]
+                continue
+            try:
+                resp = self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": t.path} for t in chunk], "Quiet": True},
+                )
+            except Exception as e:  # noqa: BLE001
+                out += [(t, e) for t in chunk]
+                continue
+            failed = {err["Key"]: err for err in resp.get("Errors", [])}
+            for t in chunk:
+                err = failed.get(t.path)
+                out.append((t, OSError(f"{err['Code']}: {err['Message']}") if err else None))
+        return out
+
+
+def _batched(targets: Iterable[Target], n: int) -> Iterator[builtins.list[Target]]:
+    it = iter(targets)
+    while batch := builtins.list(islice(it, n)):
+        yield batch
+
+
+class WorkersKind(str, Enum):
+    thread = "thread"
+    process = "process"
+
+
+class IOHint(str, Enum):
+    auto = "auto"
+    ssd = "ssd"
+    hdd = "hdd"
+
+
+def _is_rotational(path: Path) -> bool | None:
+    """Whether ``path`` lives on a spinning disk, per sysfs; None when unknown."""
+    if platform.system() != "Linux":
+        return None
+    dev = os.stat(path).st_dev
+    block = os.path.realpath(f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}")
+    # Partitions have no queue/ of their own; it lives on the parent disk
+    for base in (block, os.path.dirname(block)):
+        try:
+            with open(os.path.join(base, "queue", "rotational")) as f:
+                return f.read().strip() == "1"
+        except OSError:
+            continue
+    return None
+
+
+def _default_concurrency(path: Path, io_hint: IOHint) -> int:
+    # Seek contention makes more than a couple of concurrent deletes slower on HDDs
+    rotational = io_hint is IOHint.hdd if io_hint is not IOHint.auto else _is_rotational(path)
+    if rotational is None:
+        return 8
+    return 2 if rotational else 16
+
+
+@dataclass(frozen=True, slots=True)
+class _SweepJob:
+    """Everything a worker needs to sweep one directory tree; picklable for process pools."""
+
+    path: str
+    pattern: str
+    cutoff_ts: float
+    prune: frozenset[str]
+    archive_path: Path | None
+    archive_dev: int | None
+    dry_run: bool
+    use_statx: bool = False
+    recurse: bool = True
+    # (st_dev, st_ino) of the archive; archived files keep their mtime and would match again
+    archive_key: tuple[int, int] | None = None
+
+    def targets(self, fds: _DirFds, on_error: _OnError) -> Iterable[Target]:
+        match = _compile_pattern(self.pattern)
+        return _scan(
+            self.path,
+            match,
+            self.cutoff_ts,
+            self.prune,
+            on_error,
+            fds,
+            self.recurse,
+            use_statx=self.use_statx,
+            skip=self.archive_key,
+        )
+
+
+def _process_batch(
+    backend: Backend,
+    batch: builtins.list[Target],
+    job: _SweepJob,
+    devs: dict[str, int],
+    report: Callable[[_Report], None],
+    fds: _DirFds,
+) -> None:
+    try:
+        _archive_and_delete(backend, batch, job, devs, report)
+    finally:
+        # Only now may the directory fds these targets point at be closed
+        fds.release_all(batch)
+
+
+def _archive_and_delete(
+    backend: Backend,
+    batch: builtins.list[Target],
+    job: _SweepJob,
+    devs: dict[str, int],
+    report: Callable[[_Report], None],
+) -> None:
+    archive_path, archive_dev, dry_run = job.archive_path, job.archive_dev, job.dry_run
+    if archive_path:
+        pending = []
+        for t in batch:
+            try:
+                moved = archive_dev is not None and _dir_dev(t, devs) == archive_dev
+            except OSError:
+                moved = False
+            # Same filesystem: a rename archives and removes the source without copying data
+            t, err = (_move if moved else _copy)(t, archive_path, dry_run)
+            if moved and isinstance(err, OSError) and err.errno == errno.EXDEV:
+                # Same st_dev but a different mount (e.g. a bind mount): copy, then delete
+                devs[os.path.dirname(t.path)] = -1
+                moved = False
+                t, err = _copy(t, archive_path, dry_run)
+            report(("archive", t.path, err))
+            if moved and not err:
+                report(("delete", t.path, None))
+            elif not err:
+                # Never delete a file whose archive copy failed
+                pending.append(t)
+        batch = pending
+    for t, err in backend.delete_batch(batch, dry_run):
+        report(("delete", t.path, err))
+
+
+def _produce(
+    targets: Iterable[Target],
+    tasks: queue.Queue[builtins.list[Target] | None],
+    batch_size: int,
+    workers: int,
+    stop: threading.Event,
+    failure: builtins.list[BaseException],
+) -> None:
+    try:
+        for batch in _batched(targets, batch_size):
+            tasks.put(batch)
+            if stop.is_set():
+                break
+    except BaseException as e:  # noqa: BLE001
+        failure.append(e)
+        stop.set()
+    finally:
+        # Closing the walk releases the fds of directories it is still inside
+        close = getattr(targets, "close", None)
+        if close is not None:
+            close()
+        for _ in range(workers):
+            tasks.put(None)
+
+
+def _consume(
+    backend: Backend,
+    job: _SweepJob,
+    tasks: queue.Queue[builtins.list[Target] | None],
+    results: queue.Queue[_Result],
+    fds: _DirFds,
+    stop: threading.Event,
+    failure: builtins.list[BaseException],
+) -> None:
+    devs: dict[str, int] = {}
+    try:
+        while (batch := tasks.get()) is not None:
+            if stop.is_set():
+                # Keep draining so the producer never blocks, but touch nothing
+                fds.release_all(batch)
+                continue
+            try:
+                _process_batch(backend, batch, job, devs, results.put, fds)
+            except BaseException as e:  # noqa: BLE001
+                failure.append(e)
+                stop.set()
+    finally:
+        results.put(None)
+
+
+def _sweep_threads(job: _SweepJob, concurrency: int) -> Generator[_Report, None, None]:
+    # Both queues are bounded, so a slow reader throttles the workers and the scan
+    backend = LocalBackend()
+    tasks: queue.Queue[builtins.list[Target] | None] = queue.Queue(maxsize=concurrency * 4)
+    results: queue.Queue[_Result] = queue.Queue(maxsize=concurrency * backend.batch_size * 2)
+    stop = threading.Event()
+    failure: builtins.list[BaseException] = []
+    fds = _DirFds()
+    targets = job.targets(fds, lambda path, e: results.put(("scan", path, e)))
+    producer_args = (targets, tasks, backend.batch_size, concurrency, stop, failure)
+    threads = [threading.Thread(target=_produce, args=producer_args)]
+    threads += [
+        threading.Thread(target=_consume, args=(backend, job, tasks, results, fds, stop, failure))
+        for _ in range(concurrency)
+    ]
+    for th in threads:
+        th.daemon = True
+        th.start()
+
+    running = concurrency
+    try:
+        while running:
+            res = results.get()
+            if res is None:
+                running -= 1
+            else:
+                yield res
+    finally:
+        # Reached early if the caller stopped reading (broken pipe, Ctrl-C). Workers
+        # must be finished before any dir fd closes, or an unlink could hit a reused fd.
+        stop.set()
+        while running:
+            if results.get() is None:
+                running -= 1
+        for th in threads:
+            th.join()
+        fds.close()
+    if failure:
+        raise failure[0]
+
+
+def _sweep_subtree(job: _SweepJob) -> builtins.list[_Report]:
+    """Process-pool worker: scan and sweep one subtree, returning results for reporting."""
+    backend = LocalBackend()
+    out: builtins.list[_Report] = []
+    devs: dict[str, int] = {}
+    fds = _DirFds()
+    try:
+        targets = job.targets(fds, lambda path, e: out.append(("scan", path, e)))
+        for batch in _batched(targets, backend.batch_size):
+            _process_batch(backend, batch, job, devs, out.append, fds)
+    finally:
+        fds.close()
+    return out
+
+
+def _sweep_processes(job: _SweepJob, concurrency: int) -> Generator[_Report, None, None]:
+    # One task for the files directly under the root, one per top-level subdirectory
+    jobs = [replace(job, recurse=False)]
+    try:
+        with os.scandir(job.path) as it:
+            jobs += [
+                replace(job, path=e.path)
+                for e in it
+                if e.is_dir(follow_symlinks=False)
+                and e.name not in job.prune
+                and not _is_dir(e, job.archive_key)
+            ]
+    except OSError as e:
+        yield ("scan", job.path, e)
+        return
+    with multiprocessing.Pool(min(concurrency, len(jobs))) as pool:
+        for out in pool.imap_unordered(_sweep_subtree, jobs, chunksize=1):
+            yield from out
+
+
+_TABLE_MAX_ROWS = 5000
+
+
 def list_cmd(
     root: Annotated[
         Path,
@@ -92,17 +768,64 @@ def list_cmd(
     pattern: Annotated[
         str, typer.Option("--pattern", help="Glob pattern (e.g., '*.log' or '*.gz')]")
     ] = "*.log",
+    prune: Annotated[
+        builtins.list[str] | None,
+        typer.Option("--prune", help="Extra directory name to skip (repeatable)"),
+    ] = None,
+    limit: Annotated[
+        int | None, typer.Option("--limit", min=1, help="Only show the N oldest matches")
+    ] = None,
 ) -> None:
     """List candidate files."""
-    items = sorted(_iter_targets(root, pattern, older_than), key=lambda t: t.mtime)
-    table = Table(title="Candidates", show_lines=False)
-    table.add_column("Path")
-    table.add_column("Size (bytes)", justify="right")
-    table.add_column("Modified (UTC)")
-    for t in items:
-        table.add_row(str(t.path), str(t.size), t.mtime.isoformat())
-    console.print(table)
-    console.print(f"[bold]{len(items)}[/bold] files matched.")
+    unreadable: builtins.list[tuple[str, OSError]] = []
+    targets = _iter_targets(
+        root, pattern, older_than, prune or (), lambda path, e: unreadable.append((path, e))
+    )
+    by_age = attrgetter("mtime_ts")
+    if limit is None:
+        items = sorted(targets, key=by_age)
+    else:
+        # A bounded heap keeps only the oldest N matches in memory
+        items = heapq.nsmallest(limit, targets, key=by_age)
+    summary = (
+        f"[bold]{len(items)}[/bold] files matched."
+        if limit is None
+        else f"Showing the [bold]{len(items)}[/bold] oldest matches."
+    )
+    rows = (
+        (t.path, str(t.size), datetime.fromtimestamp(t.mtime_ts, tz=timezone.utc).isoformat())
+        for t in items
+    )
+    # Rich measures every cell to lay out a table; pipes and big listings get plain TSV
+    if not console.is_terminal or len(items) > _TABLE_MAX_ROWS:
+        sys.stdout.write("path\tsize\tmtime\n")
+        sys.stdout.writelines(f"{path}\t{size}\t{mtime}\n" for path, size, mtime in rows)
+        summary_console = err_console
+    else:
+        table = Table(title="Candidates", show_lines=False)
+        table.add_column("Path")
+        table.add_column("Size (bytes)", justify="right")
+        table.add_column("Modified (UTC)")
+        for row in rows:
+            table.add_row(*row)
+        console.print(table)
+        summary_console = console
+    failed = 0
+    for path, e in unreadable:
+        # As in sweep: only a path removed mid-scan is harmless, anything else is a failure
+        if isinstance(e, FileNotFoundError):
+            err_console.print(
+                f"[yellow]WARNING[/yellow] could not read {escape(path)}: {escape(str(e))}"
+            )
+        else:
+            failed += 1
+            err_console.print(f"[red]ERROR[/red] {escape(path)}: {escape(str(e))}")
+    summary_console.print(summary)
+    if failed:
+        raise typer.Exit(code=1)
+
+
+_FLUSH_LINES = 1024
 
 
 def sweep_cmd(
@@ -116,55 +839,101 @@ def sweep_cmd(
     pattern: Annotated[
         str, typer.Option("--pattern", help="Glob pattern (e.g., '*.log' or '*.gz')]")
     ] = "*.log",
+    prune: Annotated[
+        builtins.list[str] | None,
+        typer.Option("--prune", help="Extra directory name to skip (repeatable)"),
+    ] = None,
     concurrency: Annotated[
-        int, typer.Option("--concurrency", min=1, help="Delete worker threads")
-    ] = 8,
+        int | None,
+        typer.Option(
+            "--concurrency", min=1, help="Delete worker threads or processes [default: by disk]"
+        ),
+    ] = None,
+    io_hint: Annotated[
+        IOHint, typer.Option("--io-hint", help="Storage type used to pick the default concurrency")
+    ] = IOHint.auto,
+    workers_kind: Annotated[
+        WorkersKind,
+        typer.Option("--workers-kind", help="Run workers as threads or processes"),
+    ] = WorkersKind.thread,
     dry_run: Annotated[bool, typer.Option(help="Dry run / no changes")] = True,
     archive_path: Annotated[
         Path | None, typer.Option("--archive-to", help="Path to archive directory")
     ] = None,
+    quiet: Annotated[
+        bool, typer.Option("--quiet", "-q", help="Only report errors and the summary")
+    ] = False,
 ) -> None:
     """Archive and Delete matching files older than N days (dry-run by default)."""
-    candidates = list(_iter_targets(root, pattern, older_than))
-    if not candidates:
-        console.print("No files to archive and delete.")
-        raise typer.Exit(code=0)
-
-    console.print(f"Found {len(candidates)} files. Dry run: {dry_run}. Concurrency: {concurrency}.")
+    cutoff_ts = _cutoff_ts(older_than)
+    if concurrency is None:
+        concurrency = _default_concurrency(root, io_hint)
+    console.print(f"Sweeping {root}. Dry run: {dry_run}. Concurrency: {concurrency}.")
     errors: builtins.list[Exception] = []
+    matched = unreadable = 0
 
-    # Achiving logic
-    if archive_path:
-        console.print("Starting archiving...")
-        with ThreadPoolExecutor(max_workers=concurrency) as ex:
-            futures = [ex.submit(_copy, t, archive_path, dry_run) for t in candidates]
-            for fut in as_completed(futures):
-                t, err = fut.result()
-                if err:
+    archive_dev = archive_key = None
+    if archive_path and not dry_run:
+        archive_path.mkdir(parents=True, exist_ok=True)
+        archive_dev = os.stat(archive_path).st_dev
+    if archive_path and archive_path.is_dir():
+        st = os.stat(archive_path)
+        archive_key = (st.st_dev, st.st_ino)
+        if os.path.samestat(st, os.stat(root)):
+            raise typer.BadParameter("--archive-to must not be the directory being swept")
+    job = _SweepJob(
+        os.fspath(root),
+        pattern,
+        cutoff_ts,
+        _PRUNE.union(prune or ()),
+        archive_path,
+        archive_dev,
+        dry_run,
+        _use_statx(os.fspath(root)),
+        archive_key=archive_key,
+    )
+    sweep = _sweep_processes if workers_kind is WorkersKind.process else _sweep_threads
+    archive_action = "Would archive" if dry_run else "Archived"
+    delete_action = "Would delete" if dry_run else "Deleted"
+    # Per-file lines bypass Rich and are written in blocks; Rich only renders the summary
+    out_buf: builtins.list[str] = []
+    try:
+        with closing(sweep(job, concurrency)) as reports:
+            for kind, path, err in reports:
+                if kind == "scan" and isinstance(err, FileNotFoundError):
+                    # Removed while we were scanning: nothing left to sweep, keep going
+                    unreadable += 1
+                    out_buf.append(f"WARNING could not read {path}: {err}\n")
+                elif err:
                     errors.append(err)
-                    console.print(f"[red]ERROR[/red] {t.path}: {err}")
+                    out_buf.append(f"ERROR {path}: {err}\n")
+                elif quiet:
+                    pass
+                elif kind == "archive" and archive_path:
+                    out_buf.append(f"{archive_action}: {archive_path / os.path.basename(path)}\n")
                 else:
-                    action = "Would archive" if dry_run else "Archived"
-                    console.print(f"{action}: {archive_path / t.path.name}")
-
-    # Deletion logic
-    console.print("Starting deletion...")
-    with ThreadPoolExecutor(max_workers=concurrency) as ex:
-        futures = [ex.submit(_delete, t, dry_run) for t in candidates]
-        for fut in as_completed(futures):
-            t, err = fut.result()
-            if err:
-                errors.append(err)
-                console.print(f"[red]ERROR[/red] {t.path}: {err}")
-            else:
-                action = "Would delete" if dry_run else "Deleted"
-                console.print(f"{action}: {t.path}")
+                    out_buf.append(f"{delete_action}: {path}\n")
+                # Each target ends in exactly one delete result or a failed archive
+                if kind == "delete" or (kind == "archive" and err):
+                    matched += 1
+                if len(out_buf) >= _FLUSH_LINES:
+                    sys.stdout.write("".join(out_buf))
+                    out_buf.clear()
+    finally:
+        sys.stdout.write("".join(out_buf))
+
+    if unreadable:
+        console.print(f"[yellow]{unreadable}[/yellow] paths could not be read and were skipped.")
 
     if errors:
         console.print(f"[red]{len(errors)}[/red] errors occurred.", style="red")
         raise typer.Exit(code=1)
 
-    console.print("Done.")
+    if not matched:
+        console.print("No files to archive and delete.")
+        raise typer.Exit(code=0)
+
+    console.print(f"Done. {matched} files matched.")
 
 
 @typing.no_type_check
@@ -180,15 +949,43 @@ def sweep_cli(
     pattern: Annotated[
         str, typer.Option("--pattern", help="Glob pattern (e.g., '*.log' or '*.gz')]")
     ] = "*.log",
+    prune: Annotated[
+        builtins.list[str] | None,
+        typer.Option("--prune", help="Extra directory name to skip (repeatable)"),
+    ] = None,
     concurrency: Annotated[
-        int, typer.Option("--concurrency", min=1, help="Delete worker threads")
-    ] = 8,
+        int | None,
+        typer.Option(
+            "--concurrency", min=1, help="Delete worker threads or processes [default: by disk]"
+        ),
+    ] = None,
+    io_hint: Annotated[
+        IOHint, typer.Option("--io-hint", help="Storage type used to pick the default concurrency")
+    ] = IOHint.auto,
+    workers_kind: Annotated[
+        WorkersKind,
+        typer.Option("--workers-kind", help="Run workers as threads or processes"),
+    ] = WorkersKind.thread,
     dry_run: Annotated[bool, typer.Option(help="Dry run / no changes")] = True,
     archive_path: Annotated[
         Path | None, typer.Option("--archive-to", help="Path to archive directory")
     ] = None,
+    quiet: Annotated[
+        bool, typer.Option("--quiet", "-q", help="Only report errors and the summary")
+    ] = False,
 ) -> None:
-    return sweep_cmd(root, older_than, pattern, concurrency, dry_run, archive_path)
+    return sweep_cmd(
+        root,
+        older_than,
+        pattern,
+        prune,
+        concurrency,
+        io_hint,
+        workers_kind,
+        dry_run,
+        archive_path,
+        quiet,
+    )
 
 
 @typing.no_type_check
@@ -204,8 +1001,15 @@ def list_cli(
     pattern: Annotated[
         str, typer.Option("--pattern", help="Glob pattern (e.g., '*.log' or '*.gz')]")
     ] = "*.log",
+    prune: Annotated[
+        builtins.list[str] | None,
+        typer.Option("--prune", help="Extra directory name to skip (repeatable)"),
+    ] = None,
+    limit: Annotated[
+        int | None, typer.Option("--limit", min=1, help="Only show the N oldest matches")
+    ] = None,
 ) -> None:
-    return list_cmd(root, older_than, pattern)
+    return list_cmd(root, older_than, pattern, prune, limit)
 
 
 if __name__ == "__main__":
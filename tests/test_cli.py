@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import errno
+import fnmatch
 import os
+import shutil
+import subprocess
+import sys
 import time
 from pathlib import Path
+from typing import Any
 
+import pytest
 from typer.testing import CliRunner
 
+from sweeper import cli
 from sweeper.cli import app
 
 runner = CliRunner()
@@ -37,6 +45,7 @@ def test_list_and_sweep(tmp_path: Path) -> None:
         env={"COLUMNS": "200"},
     )
     assert res.exit_code == 0
+    assert res.stdout.startswith("path\tsize\tmtime\n")  # not a TTY, so TSV
     assert "newish.log" in res.stdout and "old.log" in res.stdout and "older.log" in res.stdout
     assert "keep.txt" not in res.stdout
 
@@ -83,3 +92,323 @@ def test_list_and_sweep(tmp_path: Path) -> None:
     assert not (tmp_path / "old.log").exists()
     assert not (tmp_path / "older.log").exists()
     assert (tmp_path / "keep.txt").exists()
+
+
+@pytest.mark.skipif(not cli._HAS_STATX, reason="statx is Linux-only")
+def test_statx_matches_stat(tmp_path: Path) -> None:
+    f = tmp_path / "a.log"
+    f.write_text("hello")
+    os.utime(f, (1_000_000_000.5, 1_000_000_000.5))
+    st = os.stat(f)
+    assert cli._statx_mtime_size(str(f)) == (st.st_mtime, st.st_size)
+
+
+@pytest.mark.parametrize(
+    "pattern", ["*", "**", "*.log", "*.lo?", "app-*.gz", "*.[lg]og", "*.log.*"]
+)
+def test_compile_pattern_matches_fnmatch(pattern: str) -> None:
+    match = cli._compile_pattern(pattern)
+    assert (match is None) == (pattern in ("*", "**"))
+    for name in ["a.log", ".log", "a.log.1", "a.LOG", "app-1.gz", "a.gog", "keep.txt"]:
+        assert bool(match is None or match(name)) == fnmatch.fnmatch(name, pattern)
+
+
+def test_list_prunes_dirs(tmp_path: Path) -> None:
+    for d in ["node_modules", "cache", "logs"]:
+        (tmp_path / d).mkdir()
+        (tmp_path / d / f"{d}.log").write_text(d)
+
+    res = runner.invoke(
+        app,
+        ["list", str(tmp_path), "--older-than", "0m", "--prune", "cache"],
+        env={"COLUMNS": "200"},
+    )
+    assert res.exit_code == 0
+    assert "logs.log" in res.stdout
+    assert "node_modules.log" not in res.stdout and "cache.log" not in res.stdout
+
+
+def test_sweep_archive_same_filesystem_renames(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    f = root / "a.log"
+    f.write_text("a")
+    ino = f.stat().st_ino
+    archive = tmp_path / "archive"
+
+    res = runner.invoke(
+        app,
+        ["sweep", str(root), "--older-than", "0m", "--no-dry-run", "--archive-to", str(archive)],
+    )
+    assert res.exit_code == 0
+    assert not f.exists()
+    assert (archive / "a.log").stat().st_ino == ino
+
+
+@pytest.mark.parametrize("workers_kind", ["thread", "process"])
+def test_sweep_skips_archive_inside_root(tmp_path: Path, workers_kind: str) -> None:
+    (tmp_path / "a.log").write_text("a")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.log").write_text("b")
+    archive = tmp_path / "archive"
+    args = ["sweep", str(tmp_path), "--older-than", "0m", "--no-dry-run"]
+    args += ["--archive-to", str(archive), "--workers-kind", workers_kind]
+
+    first = runner.invoke(app, args)
+    second = runner.invoke(app, args)
+
+    assert first.exit_code == 0 and "Done. 2 files matched." in first.stdout
+    assert second.exit_code == 0 and "No files to archive and delete." in second.stdout
+    assert sorted(p.name for p in archive.iterdir()) == ["a.log", "b.log"]
+
+
+def test_sweep_rejects_root_as_archive(tmp_path: Path) -> None:
+    (tmp_path / "a.log").write_text("a")
+    args = ["sweep", str(tmp_path), "--older-than", "0m", "--no-dry-run"]
+
+    res = runner.invoke(app, [*args, "--archive-to", str(tmp_path)])
+
+    assert res.exit_code != 0
+    assert (tmp_path / "a.log").read_text() == "a"
+
+
+def test_sweep_archive_falls_back_to_copy_across_bind_mounts(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "a.log").write_text("a")
+    (root / "b.log").write_text("b")
+    archive = tmp_path / "archive"
+
+    def cross_device(src: str, dst: Path) -> None:
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV), src, str(dst))
+
+    monkeypatch.setattr(cli.os, "replace", cross_device)
+    res = runner.invoke(
+        app,
+        ["sweep", str(root), "--older-than", "0m", "--no-dry-run", "--archive-to", str(archive)],
+    )
+    assert res.exit_code == 0, res.output
+    assert list(root.iterdir()) == []
+    assert (archive / "a.log").read_text() == "a" and (archive / "b.log").read_text() == "b"
+
+
+def test_copy_preserves_contents(tmp_path: Path) -> None:
+    src = tmp_path / "a.log"
+    src.write_bytes(b"x" * 100_000)
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    t = cli.Target(None, "a.log", str(src), 100_000, 0.0)
+
+    assert cli._copy(t, archive, dry_run=False) == (t, None)
+    assert (archive / "a.log").read_bytes() == src.read_bytes()
+
+
+def test_copy_onto_itself_keeps_source(tmp_path: Path) -> None:
+    src = tmp_path / "a.log"
+    src.write_text("keep")
+    t = cli.Target(None, "a.log", str(src), 4, 0.0)
+
+    _, err = cli._copy(t, tmp_path, dry_run=False)
+
+    assert isinstance(err, shutil.SameFileError)
+    assert src.read_text() == "keep"
+
+
+def test_s3_backend_batches_deletes() -> None:
+    calls: list[list[str]] = []
+
+    class FakeClient:
+        def delete_objects(self, **kwargs: Any) -> dict[str, Any]:
+            assert kwargs["Bucket"] == "bucket"
+            calls.append([o["Key"] for o in kwargs["Delete"]["Objects"]])
+            return {"Errors": [{"Key": "k/7", "Code": "AccessDenied", "Message": "no"}]}
+
+    targets = [cli.Target(None, str(i), f"k/{i}", 0, 0.0) for i in range(2500)]
+    results = cli.S3Backend(FakeClient(), "bucket").delete_batch(targets, dry_run=False)
+
+    assert [len(c) for c in calls] == [1000, 1000, 500]
+    assert [t for t, err in results if err] == [targets[7]]
+
+
+def test_sweep_with_process_workers(tmp_path: Path) -> None:
+    for rel in ["top.log", "a/one.log", "a/deep/two.log", "b/three.log", "b/keep.txt"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(rel)
+
+    res = runner.invoke(
+        app,
+        [
+            "sweep",
+            str(tmp_path),
+            "--older-than",
+            "0m",
+            "--no-dry-run",
+            "--workers-kind",
+            "process",
+            "--concurrency",
+            "2",
+        ],
+    )
+    assert res.exit_code == 0
+    assert "4 files matched" in res.stdout
+    assert sorted(p.name for p in tmp_path.rglob("*") if p.is_file()) == ["keep.txt"]
+
+
+def test_sweep_quiet_prints_only_summary(tmp_path: Path) -> None:
+    (tmp_path / "a.log").write_text("a")
+
+    res = runner.invoke(app, ["sweep", str(tmp_path), "--older-than", "0m", "--quiet"])
+    assert res.exit_code == 0
+    assert "Would delete" not in res.stdout
+    assert "1 files matched" in res.stdout
+
+
+def test_list_limit_shows_oldest(tmp_path: Path) -> None:
+    now = time.time()
+    for i, name in enumerate(["c.log", "a.log", "b.log"]):
+        f = tmp_path / name
+        f.write_text(name)
+        os.utime(f, (now - 3600 * (i + 1), now - 3600 * (i + 1)))
+
+    res = runner.invoke(app, ["list", str(tmp_path), "--older-than", "0m", "--limit", "2"])
+    assert res.exit_code == 0
+    rows = res.stdout.splitlines()[1:]
+    assert [Path(r.split("\t")[0]).name for r in rows] == ["b.log", "a.log"]
+
+
+def test_target_is_slotted() -> None:
+    # Sweeps can hold many Targets in flight; keep them free of a per-instance __dict__
+    t = cli.Target(None, "a.log", "a.log", 0, 0.0)
+    assert not hasattr(t, "__dict__")
+
+
+@pytest.mark.parametrize(("hint", "expected"), [("hdd", 2), ("ssd", 16)])
+def test_sweep_io_hint_sets_default_concurrency(tmp_path: Path, hint: str, expected: int) -> None:
+    res = runner.invoke(app, ["sweep", str(tmp_path), "--io-hint", hint])
+    assert res.exit_code == 0
+    assert f"Concurrency: {expected}." in res.stdout
+
+
+@pytest.mark.parametrize(
+    ("error", "exit_code", "message"),
+    [(FileNotFoundError, 0, "WARNING could not read"), (PermissionError, 1, "ERROR")],
+)
+def test_sweep_scan_errors_warn_on_vanished_paths_and_fail_otherwise(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    error: type[OSError],
+    exit_code: int,
+    message: str,
+) -> None:
+    (tmp_path / "gone.log").write_text("gone")
+    (tmp_path / "old.log").write_text("old")
+    real_stat = cli._statx_mtime_size if cli._HAS_STATX else None
+
+    def flaky_stat(path: str, dir_fd: int = cli._AT_FDCWD) -> tuple[float, int]:
+        if path.endswith("gone.log"):
+            raise error(0, "unreadable", path)
+        if real_stat is not None:
+            return real_stat(path, dir_fd)
+        st = os.stat(path, dir_fd=None if dir_fd == cli._AT_FDCWD else dir_fd)
+        return (st.st_mtime, st.st_size)
+
+    monkeypatch.setattr(cli, "_use_statx", lambda _path: True)
+    monkeypatch.setattr(cli, "_statx_mtime_size", flaky_stat)
+    listed = runner.invoke(app, ["list", str(tmp_path), "--older-than", "0m"])
+    assert listed.exit_code == exit_code
+    assert message.split()[0] in listed.output and "old.log" in listed.output
+
+    res = runner.invoke(app, ["sweep", str(tmp_path), "--older-than", "0m", "--no-dry-run"])
+    assert res.exit_code == exit_code
+    assert message in res.stdout and "gone.log" in res.stdout
+    assert not (tmp_path / "old.log").exists()
+
+
+@pytest.mark.parametrize("pattern", ["*", "*.log"])
+def test_scan_filters_and_prunes(tmp_path: Path, pattern: str) -> None:
+    now = time.time()
+    for rel in ["a.log", "b.txt", "new.log", "x/c.log", "x/y/d.log", ".git/e.log", "skip/f.log"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(rel)
+        if rel != "new.log":
+            os.utime(tmp_path / rel, (now - 3600, now - 3600))
+    errors: list[tuple[str, OSError]] = []
+
+    found = cli._scan(
+        str(tmp_path),
+        cli._compile_pattern(pattern),
+        now - 60,
+        cli._PRUNE | {"skip"},
+        lambda path, e: errors.append((path, e)),
+        None,
+    )
+    names = sorted(t.name for t in found)
+    assert errors == []
+    expected = ["a.log", "c.log", "d.log"]
+    assert names == (sorted([*expected, "b.txt"]) if pattern == "*" else expected)
+
+
+def test_fs_type_of_proc() -> None:
+    if not os.path.exists("/proc/self/mountinfo"):
+        pytest.skip("needs /proc/self/mountinfo")
+    assert cli._fs_type("/proc/self") == "proc"
+    assert not cli._use_statx("/proc/self")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs RLIMIT_NOFILE")
+def test_sweep_many_dirs_under_low_fd_limit(tmp_path: Path) -> None:
+    import resource
+
+    old = time.time() - 3 * 24 * 3600
+    for i in range(400):
+        f = tmp_path / f"d{i}" / "a.log"
+        f.parent.mkdir()
+        f.write_text("a")
+        os.utime(f, (old, old))
+
+    def low_fd_limit() -> None:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (128, 128))
+
+    res = subprocess.run(
+        [sys.executable, "-m", "sweeper.cli", "sweep", str(tmp_path), "--older-than", "1d"]
+        + ["--no-dry-run", "--quiet", "--concurrency", "2"],
+        preexec_fn=low_fd_limit,
+        capture_output=True,
+        text=True,
+    )
+    assert res.returncode == 0, res.stdout + res.stderr
+    assert "could not read" not in res.stdout
+    assert list(tmp_path.rglob("*.log")) == []
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc/self/fd")
+def test_sweep_threads_stop_cleanly_when_caller_stops_reading(tmp_path: Path) -> None:
+    import threading
+
+    old = time.time() - 3 * 24 * 3600
+    for i in range(200):
+        f = tmp_path / f"d{i % 20}" / f"{i}.log"
+        f.parent.mkdir(exist_ok=True)
+        f.write_text("a")
+        os.utime(f, (old, old))
+    job = cli._SweepJob(str(tmp_path), "*.log", time.time(), frozenset(), None, None, True)
+    fds_before = len(os.listdir("/proc/self/fd"))
+    threads_before = threading.active_count()
+
+    reports = cli._sweep_threads(job, 4)
+    next(reports)
+    reports.close()
+
+    assert threading.active_count() == threads_before
+    assert len(os.listdir("/proc/self/fd")) == fds_before
+
+
+def test_sweep_processes_reports_unreadable_root(tmp_path: Path) -> None:
+    job = cli._SweepJob(str(tmp_path / "gone"), "*", time.time(), frozenset(), None, None, True)
+
+    [(kind, path, err)] = list(cli._sweep_processes(job, 2))
+
+    assert (kind, path) == ("scan", job.path)
+    assert isinstance(err, FileNotFoundError)